@@ -17,16 +17,26 @@ from src.vm import ScrawlVM, TraceSeverity
 from src.synapse import Instruction
 from src.opcodes import ConsensusOp, IdentityOp, ExecutionOp
 
+# Severity value → name, resolved once — severities are dense ints
+# starting at 0, so a tuple index beats even a dict hit per event
+_SEV_NAMES = tuple(s.name for s in sorted(TraceSeverity, key=lambda s: s.value))
+
+
+def _print_audit(audit_log):
+    for ev in audit_log:
+        print(f"  [{_SEV_NAMES[ev.severity]:8s}] "
+              f"{ev.domain}.{ev.event_type}: {ev.message}")
+
 
 def main():
     print("=== SCRAWL Consensus Vote ===\n")
 
-    # Capture trace events for audit
+    # Capture trace events for audit — store the event itself (the VM
+    # already owns it); formatting happens only when the trail prints
     audit_log = []
 
     def audit_hook(event):
-        severity = TraceSeverity(event.severity).name
-        audit_log.append(f"  [{severity:8s}] {event.domain}.{event.event_type}: {event.message}")
+        audit_log.append(event)
 
     # Agent 0: Proposes and votes APPROVE
     vm = ScrawlVM()
@@ -62,20 +72,18 @@ def main():
     result = vm.execute(program)
 
     print("Audit Trail:")
-    for line in audit_log:
-        print(line)
+    _print_audit(audit_log)
 
     commit_result = vm.registers.get_reg(1)
     print(f"\n  Proposal committed: {'YES' if commit_result == 1 else 'NO'}")
     print(f"  Instructions executed: {result.instructions_executed}")
     print(f"  Trace events: {len(result.trace_events)}")
 
-    # Show what happens when a vote is REJECTED
+    # Show what happens when a vote is REJECTED — reuse the warm VM
+    # (registers, dispatch table, and the audit hook stay in place)
     print("\n--- Rejection Scenario ---\n")
     audit_log.clear()
-    vm2 = ScrawlVM()
-    vm2.agent_id = 0
-    vm2.add_trace_hook(audit_hook)
+    vm.reset()
 
     rejection_program = [
         Instruction(ConsensusOp.C_PROPOSE, [2, 0, [0, 1, 2]]),
@@ -86,16 +94,15 @@ def main():
         Instruction(ExecutionOp.X_HALT),
     ]
 
-    vm2.execute(rejection_program)
+    vm.execute(rejection_program)
     print("Audit Trail:")
-    for line in audit_log:
-        print(line)
+    _print_audit(audit_log)
 
     # Filter for warnings and errors
-    warnings = vm2.get_trace_events(TraceSeverity.WARN)
+    warnings = vm.get_trace_events(TraceSeverity.WARN)
     print(f"\n  Warnings/Errors: {len(warnings)}")
     for w in warnings:
-        print(f"    {TraceSeverity(w.severity).name}: {w.message}")
+        print(f"    {_SEV_NAMES[w.severity]}: {w.message}")
 
     print("\n=== Consensus Demo Complete ===")
 
@@ -35,7 +35,8 @@ def main():
     # Agent B responds — verifies fingerprint matches
     baseline_b, match = IdentityHandshake.respond(seed, depth, fingerprint_a)
     print(f"  Agent B: fingerprint match = {match}")
-    print(f"  Chain values are integers: {all(isinstance(v, int) for v in baseline_a.chain)}")
+    # int64 storage is a type invariant — one typecode check, no O(depth) scan
+    print(f"  Chain values are integers: {baseline_a.chain.typecode == 'q'}")
 
     # ── Step 2: Derive shared key ──
     print("\nStep 2: Shared Key Derivation")
@@ -50,7 +50,7 @@ def main():
     baseline = vm.baselines[0]
     print(f"\n  Baseline: seed=0x{baseline.seed:04X}, depth={baseline.depth}")
     print(f"  Chain (first 5): {baseline.chain[:5]}")
-    print(f"  All chain values are integers: {all(isinstance(v, int) for v in baseline.chain)}")
+    print(f"  All chain values are integers: {baseline.chain.typecode == 'q'}")
 
     print("\n=== Heartbeat OK ===")
 
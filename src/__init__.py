@@ -0,0 +1,16 @@
+"""
+SCRAWL v1.1 — Structured Compressed Runtime for Agent-to-Agent Workload Language
+
+Core package. Zero external dependencies — everything here runs on a
+bare Python 3.10+ install.
+
+Modules:
+    opcodes    84 instructions across 6 domains
+    registers  Tensors and the register file
+    synapse    Binary wire format
+    rosetta    Bidirectional transpiler + macro layer
+    identity   ML Identity foundation (baselines, chains, delta)
+    vm         Register-based execution engine + trace hooks
+"""
+
+__version__ = "1.1.0"
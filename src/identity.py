@@ -0,0 +1,342 @@
+"""
+SCRAWL Identity — the ML Identity foundation.
+
+Everything here is built on the ML Identity:
+
+    a + a² + b = b²    where b = a + 1
+
+Integer arithmetic only — no float ever touches the identity path, so
+chains derive bit-identically on every platform (§2.3 of the ML
+Identity paper). Values are masked to 63 bits to stay in fixed range.
+
+Chain derivation is the hottest loop in the handshake path, so it runs
+as a single tight loop over bound locals with gnomon updates
+(Theorems 4 + 5): the next square is reached by addition —
+(a+1)² = a² + a + (a+1) — never by multiplication. The only multiply
+is seeding a² once before the loop.
+"""
+
+import hashlib
+import sys
+import zlib
+from array import array
+
+
+_MASK = (1 << 63) - 1
+
+
+# ─── Core identity functions ─────────────────────────────────────────
+
+def ml_identity(a):
+    """Evaluate the ML Identity at `a`. Returns (b, lhs) with b = a + 1.
+
+    The identity guarantees lhs == b * b.
+    """
+    b = a + 1
+    return b, a + a * a + b
+
+
+def ml_identity_verify(a):
+    """True iff the ML Identity holds at `a` (it always does)."""
+    b, lhs = ml_identity(a)
+    return lhs == b * b
+
+
+def ml_gnomon_update(a_sq, a):
+    """Advance a square by one gnomon: given a² and a, return (a+1)².
+
+    (a+1)² = a² + a + (a+1) — addition only (Theorem 4).
+    """
+    return a_sq + a + a + 1
+
+
+def ml_algebraic_verify(a, a_sq, b, b_sq):
+    """Zero-cost integrity check: a + a² + b == b² (one add, one compare)."""
+    return a + a_sq + b == b_sq
+
+
+# ─── Chain derivation ────────────────────────────────────────────────
+
+def _derive_chain(seed, depth):
+    """Derive a `depth`-link integer chain from `seed`.
+
+    One pass, all names bound to locals, gnomon stepping for the square.
+    Each link is the masked square b² folded with a seed-derived term so
+    distinct seeds diverge immediately.
+
+    The chain lives in a packed int64 buffer (`array.array('q')`) —
+    8 bytes per link in one contiguous allocation instead of a pointer
+    to a ~28-byte PyLong per link. Links mask to 63 bits, so every
+    value fits the signed slot, indexing still yields plain Python
+    ints, and `.tobytes()` exposes the whole chain for one-call
+    hashing.
+    """
+    chain = array("q", bytes(8 * depth))
+    mask = _MASK
+    a = seed & mask
+    a_sq = (a * a) & mask
+    for i in range(depth):
+        b = a + 1
+        b_sq = (a_sq + a + b) & mask          # gnomon: no multiplication
+        chain[i] = (b_sq ^ ((seed >> (i & 31)) + i)) & mask
+        a = b
+        a_sq = b_sq
+    return chain
+
+
+def ml_fingerprint(chain, seed):
+    """16-byte keyed BLAKE2b digest of a packed int64 chain.
+
+    One hash call over the contiguous buffer — no per-element update
+    loop. Keying with the seed binds the digest to the baseline
+    parameters, so equal chains from different seeds don't collide.
+    BLAKE2b's compression function is C-backed in CPython's hashlib,
+    so the whole digest costs roughly a cycle per byte.
+    """
+    if sys.byteorder == "little":
+        raw = chain.tobytes()
+    else:
+        swapped = array("q", chain)
+        swapped.byteswap()
+        raw = swapped.tobytes()
+    return hashlib.blake2b(
+        raw, key=(seed & _MASK).to_bytes(8, "little"),
+        digest_size=16).digest()
+
+
+class IdentityBaseline:
+    """A shared mathematical baseline derived from (seed, depth).
+
+    Two agents with the same seed and depth derive bit-identical
+    chains — the foundation for delta compression and handshakes.
+    """
+
+    def __init__(self, seed, depth):
+        self.seed = int(seed)
+        self.depth = int(depth)
+        self.chain = _derive_chain(self.seed, self.depth)
+
+    def verify(self):
+        """Re-derive the chain and confirm it matches (corruption check)."""
+        return self.chain == _derive_chain(self.seed, self.depth)
+
+    def fingerprint(self):
+        """16-byte keyed digest identifying this baseline."""
+        return ml_fingerprint(self.chain, self.seed)
+
+    def fingerprint64(self):
+        """Fingerprint truncated to an unsigned 64-bit integer (for R-regs)."""
+        return int.from_bytes(self.fingerprint()[:8], "little")
+
+    def chain_bytes(self):
+        """The whole chain as little-endian bytes, in one call.
+
+        `tobytes()` is native-order, so big-endian platforms byteswap a
+        throwaway copy first — fingerprints must agree everywhere.
+        """
+        if sys.byteorder == "little":
+            return self.chain.tobytes()
+        swapped = array("q", self.chain)
+        swapped.byteswap()
+        return swapped.tobytes()
+
+    def keystream(self, length):
+        """`length` bytes of baseline-derived keystream (chain bytes, cycled)."""
+        raw = self.chain_bytes()
+        reps = length // len(raw) + 1
+        return (raw * reps)[:length]
+
+    def __repr__(self):
+        return f"IdentityBaseline(seed=0x{self.seed:X}, depth={self.depth})"
+
+
+# ─── Handshake ───────────────────────────────────────────────────────
+
+class IdentityHandshake:
+    """Two-message baseline agreement between agents."""
+
+    @staticmethod
+    def initiate(seed, depth):
+        """Agent A: derive a baseline, return (baseline, fingerprint)."""
+        baseline = IdentityBaseline(seed, depth)
+        return baseline, baseline.fingerprint()
+
+    @staticmethod
+    def respond(seed, depth, peer_fingerprint):
+        """Agent B: derive from the same parameters, check the fingerprint.
+
+        Returns (baseline, match). A mismatch means the peer derived a
+        different chain — wrong seed, wrong depth, or a broken platform.
+        """
+        baseline = IdentityBaseline(seed, depth)
+        return baseline, baseline.fingerprint() == peer_fingerprint
+
+    @staticmethod
+    def derive_shared_key(baseline, agent_a_id, agent_b_id):
+        """32-byte session key bound to the baseline and both agent IDs.
+
+        Order-independent: (a, b) and (b, a) derive the same key.
+        """
+        lo, hi = sorted((int(agent_a_id), int(agent_b_id)))
+        h = hashlib.sha256()
+        h.update(baseline.fingerprint())
+        h.update(lo.to_bytes(8, "little"))
+        h.update(hi.to_bytes(8, "little"))
+        return h.digest()
+
+
+# ─── Delta compression ───────────────────────────────────────────────
+
+class DeltaError(Exception):
+    """Raised when a delta stream is truncated or corrupt."""
+
+
+# Frame tags (first byte of every compressed frame)
+_TAG_RAW = 0x00    # payload follows verbatim
+_TAG_RLE = 0x01    # zero-run-length-encoded delta vs previous state
+_TAG_SAME = 0x02   # identical to previous state (5-byte frame)
+_TAG_DEFLATE = 0x03  # deflate-compressed delta vs previous state
+
+# Below this size the deflate header/dictionary overhead eats the win;
+# small frames stay on the zero-run RLE path.
+_DEFLATE_THRESHOLD = 64
+
+# RLE tokens inside a _TAG_RLE frame
+_RLE_ZEROS = 0x00  # u16 count of zero bytes
+_RLE_LITERAL = 0x01  # u16 length + that many literal bytes
+
+_MIN_ZERO_RUN = 4  # shorter zero runs ride along in literals
+
+
+class DeltaCompressor:
+    """Transmit only what changed.
+
+    Each message is XOR'd against the previous one; near-identical
+    consecutive states produce deltas that are mostly zero bytes, which
+    run-length-encode down to a few bytes. Identical retransmits are a
+    5-byte frame. Both ends must start from the same baseline and see
+    the same message sequence.
+    """
+
+    def __init__(self, baseline):
+        self.baseline = baseline
+        self._prev = b""
+
+    def compress(self, state):
+        """Compress `state` against the previous message."""
+        if state and state == self._prev:
+            return bytes((_TAG_SAME,)) + len(state).to_bytes(4, "little")
+
+        prev = self._prev
+        if len(prev) < len(state):
+            prev = prev + bytes(len(state) - len(prev))
+        delta = bytes(x ^ y for x, y in zip(state, prev))
+        self._prev = state
+
+        # Near-identical consecutive states XOR into long zero runs,
+        # which LZ77-family compressors collapse to a few bytes. Small
+        # frames skip deflate — its overhead beats the savings there.
+        best_tag, best = _TAG_RAW, state
+        if len(state) >= _DEFLATE_THRESHOLD:
+            deflated = zlib.compress(delta, 1)
+            if len(deflated) < len(best):
+                best_tag, best = _TAG_DEFLATE, deflated
+        encoded = _rle_encode(delta)
+        if len(encoded) < len(best):
+            best_tag, best = _TAG_RLE, encoded
+        return bytes((best_tag,)) + best
+
+    def decompress(self, frame):
+        """Recover the original state from a compressed frame."""
+        if not frame:
+            raise DeltaError("empty frame")
+        tag = frame[0]
+
+        if tag == _TAG_SAME:
+            if len(frame) != 5:
+                raise DeltaError("malformed SAME frame")
+            length = int.from_bytes(frame[1:5], "little")
+            if length != len(self._prev):
+                raise DeltaError("SAME frame length disagrees with history")
+            return self._prev
+
+        if tag == _TAG_RAW:
+            state = frame[1:]
+            self._prev = state
+            return state
+
+        if tag == _TAG_RLE or tag == _TAG_DEFLATE:
+            if tag == _TAG_RLE:
+                delta = _rle_decode(frame[1:])
+            else:
+                try:
+                    delta = zlib.decompress(frame[1:])
+                except zlib.error as err:
+                    raise DeltaError(f"corrupt deflate delta: {err}") from None
+            prev = self._prev
+            if len(prev) < len(delta):
+                prev = prev + bytes(len(delta) - len(prev))
+            state = bytes(x ^ y for x, y in zip(delta, prev))
+            self._prev = state
+            return state
+
+        raise DeltaError(f"unknown frame tag 0x{tag:02X}")
+
+
+def _rle_encode(delta):
+    """Zero-run RLE: long zero runs become 3-byte tokens."""
+    out = bytearray()
+    n = len(delta)
+    i = 0
+    lit_start = 0
+    while i < n:
+        if delta[i] == 0:
+            j = i
+            while j < n and delta[j] == 0:
+                j += 1
+            if j - i >= _MIN_ZERO_RUN:
+                _flush_literal(out, delta, lit_start, i)
+                run = j - i
+                while run > 0:
+                    chunk = min(run, 0xFFFF)
+                    out.append(_RLE_ZEROS)
+                    out += chunk.to_bytes(2, "little")
+                    run -= chunk
+                lit_start = j
+            i = j
+        else:
+            i += 1
+    _flush_literal(out, delta, lit_start, n)
+    return bytes(out)
+
+
+def _flush_literal(out, delta, start, end):
+    while start < end:
+        chunk = min(end - start, 0xFFFF)
+        out.append(_RLE_LITERAL)
+        out += chunk.to_bytes(2, "little")
+        out += delta[start:start + chunk]
+        start += chunk
+
+
+def _rle_decode(encoded):
+    """Inverse of _rle_encode. Raises DeltaError on a corrupt stream."""
+    out = bytearray()
+    i = 0
+    n = len(encoded)
+    while i < n:
+        token = encoded[i]
+        if i + 3 > n:
+            raise DeltaError("truncated RLE token")
+        count = int.from_bytes(encoded[i + 1:i + 3], "little")
+        i += 3
+        if token == _RLE_ZEROS:
+            out += bytes(count)
+        elif token == _RLE_LITERAL:
+            if i + count > n:
+                raise DeltaError("truncated RLE literal")
+            out += encoded[i:i + count]
+            i += count
+        else:
+            raise DeltaError(f"unknown RLE token 0x{token:02X}")
+    return bytes(out)
@@ -0,0 +1,165 @@
+"""
+SCRAWL Opcodes — 84 instructions across 6 domains.
+
+Every opcode is a single byte. The high nibble selects the domain:
+
+    0x0_  Tensor      (15 ops)
+    0x1_  Attention   (14 ops)
+    0x2_  Execution   (16 ops)
+    0x3_  State       (15 ops)
+    0x4_  Consensus   (12 ops)
+    0x5_  Identity    (12 ops)
+
+0x60–0xFF is reserved for domain-specific extensions (see
+CONTRIBUTING.md). Opcode values are wire-format stable: once shipped,
+a value never changes meaning.
+"""
+
+from enum import IntEnum
+
+
+class TensorOp(IntEnum):
+    """Tensor domain — dense float32 math on TR registers."""
+    T_COMPOSE = 0x00
+    T_DECOMPOSE = 0x01
+    T_TRANSFORM = 0x02
+    T_RESHAPE = 0x03
+    T_SLICE = 0x04
+    T_REDUCE = 0x05
+    T_QUANTIZE = 0x06
+    T_BROADCAST = 0x07
+    T_FILL = 0x08
+    T_COPY = 0x09
+    T_COMPARE = 0x0A
+    T_CONVERT = 0x0B
+    T_NORM = 0x0C
+    T_RANDOM = 0x0D
+    T_EINSUM = 0x0E
+
+
+class AttentionOp(IntEnum):
+    """Attention domain — routing and focus over tensor registers."""
+    A_ROUTE = 0x10
+    A_MASK = 0x11
+    A_FOCUS = 0x12
+    A_SCATTER = 0x13
+    A_GATHER = 0x14
+    A_CROSS = 0x15
+    A_SELF = 0x16
+    A_MULTIHEAD = 0x17
+    A_SPARSE = 0x18
+    A_LINEAR = 0x19
+    A_FLASH = 0x1A
+    A_WINDOW = 0x1B
+    A_POOL = 0x1C
+    A_TOPK = 0x1D
+
+
+class ExecutionOp(IntEnum):
+    """Execution domain — control flow and scheduling."""
+    X_NOP = 0x20
+    X_HALT = 0x21
+    X_YIELD = 0x22
+    X_ABORT = 0x23
+    X_BRANCH = 0x24
+    X_LOOP = 0x25
+    X_CALL = 0x26
+    X_RETURN = 0x27
+    X_FORK = 0x28
+    X_JOIN = 0x29
+    X_TRAP = 0x2A
+    X_RESUME = 0x2B
+    X_SPAWN = 0x2C
+    X_KILL = 0x2D
+    X_SLEEP = 0x2E
+    X_WAKE = 0x2F
+
+
+class StateOp(IntEnum):
+    """State domain — shared state sync and storage."""
+    S_SYNC = 0x30
+    S_LOCK = 0x31
+    S_UNLOCK = 0x32
+    S_DELTA = 0x33
+    S_APPLY = 0x34
+    S_SNAPSHOT = 0x35
+    S_RESTORE = 0x36
+    S_PUBLISH = 0x37
+    S_SUBSCRIBE = 0x38
+    S_WATCH = 0x39
+    S_CAS = 0x3A
+    S_LOAD = 0x3B
+    S_STORE = 0x3C
+    S_EVICT = 0x3D
+    S_PREFETCH = 0x3E
+
+
+class ConsensusOp(IntEnum):
+    """Consensus domain — multi-agent agreement as VM operations."""
+    C_PROPOSE = 0x40
+    C_VOTE = 0x41
+    C_COMMIT = 0x42
+    C_REJECT = 0x43
+    C_QUORUM = 0x44
+    C_ESCALATE = 0x45
+    C_TIMEOUT = 0x46
+    C_REVOKE = 0x47
+    C_DELEGATE = 0x48
+    C_AUDIT = 0x49
+    C_VETO = 0x4A
+    C_RATIFY = 0x4B
+
+
+class IdentityOp(IntEnum):
+    """Identity domain — ML Identity baselines, chains, fingerprints."""
+    I_DERIVE = 0x50
+    I_VERIFY = 0x51
+    I_BASELINE = 0x52
+    I_RECONSTRUCT = 0x53
+    I_ROTATE = 0x54
+    I_CHALLENGE = 0x55
+    I_RESPOND = 0x56
+    I_BIND = 0x57
+    I_UNBIND = 0x58
+    I_FINGERPRINT = 0x59
+    I_CHAIN = 0x5A
+    I_SPLIT = 0x5B
+
+
+class ComposeMode(IntEnum):
+    """Second-level selector for T_COMPOSE."""
+    DOT = 0
+    ADD = 1
+    SUB = 2
+    HADAMARD = 3
+    MATMUL = 4
+
+
+# First value past the core ISA (extension range starts here).
+N_OPCODES = 0x60
+
+ALL_DOMAINS = (
+    TensorOp, AttentionOp, ExecutionOp, StateOp, ConsensusOp, IdentityOp,
+)
+
+_DOMAIN_NAMES = (
+    "tensor", "attention", "execution", "state", "consensus", "identity",
+)
+
+OPCODE_BY_VALUE = {
+    int(op): op for domain in ALL_DOMAINS for op in domain
+}
+
+
+def mnemonic(value):
+    """Mnemonic for an opcode value, or a hex placeholder for unknowns."""
+    op = OPCODE_BY_VALUE.get(int(value))
+    return op.name if op is not None else f"OP_{int(value):02X}"
+
+
+def domain_name(value):
+    """Domain name ('tensor', 'consensus', …) for an opcode value."""
+    nibble = (int(value) >> 4) & 0xF
+    if nibble < len(_DOMAIN_NAMES):
+        return _DOMAIN_NAMES[nibble]
+    return "extension"
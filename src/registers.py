@@ -0,0 +1,201 @@
+"""
+SCRAWL Registers — Tensors and the register file.
+
+The VM owns one RegisterFile:
+
+    256 general-purpose registers (R0–R255)   — integers
+     64 tensor registers          (TR0–TR63)  — Tensor objects
+     16 context registers         (CR0–CR15)  — opaque context slots
+
+Tensors are dense float32 values in a single contiguous buffer
+(`array.array('f')`). In-place operations rewrite the buffer with one
+bulk slice assignment driven by C-level iteration (`map` over the
+typed arrays) instead of a Python-level per-element loop, so the hot
+add/sub/scale/hadamard path does no per-element interpreter dispatch
+and allocates no per-element objects. Pure stdlib — no numpy.
+"""
+
+import math
+import operator
+from array import array
+
+
+class RegisterError(Exception):
+    """Raised on invalid register access or tensor shape mismatch."""
+
+
+class Tensor:
+    """Dense float32 tensor with contiguous storage.
+
+    `data` is an `array.array('f')` — one flat C buffer, iterable like
+    any sequence, indexable, and convertible with `.tobytes()`.
+    `shape` is a tuple of dimensions; row-major layout.
+    """
+
+    __slots__ = ("data", "shape")
+
+    def __init__(self, data, shape=None):
+        if isinstance(data, array) and data.typecode == "f":
+            flat = data
+        else:
+            flat = array("f", data)
+        if shape is None:
+            shape = (len(flat),)
+        shape = tuple(int(s) for s in shape)
+        if math.prod(shape) != len(flat):
+            raise RegisterError(
+                f"shape {shape} does not match {len(flat)} elements")
+        self.data = flat
+        self.shape = shape
+
+    # ── Constructors ──
+
+    @classmethod
+    def zeros(cls, shape):
+        """All-zero tensor of the given shape."""
+        shape = tuple(int(s) for s in shape)
+        return cls(array("f", bytes(4 * math.prod(shape))), shape)
+
+    @classmethod
+    def filled(cls, shape, value):
+        """Constant tensor of the given shape."""
+        shape = tuple(int(s) for s in shape)
+        return cls(array("f", [float(value)] * math.prod(shape)), shape)
+
+    # ── Properties ──
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    @property
+    def rows(self):
+        """Row count for 2-D tensors (1 for vectors)."""
+        return self.shape[0] if len(self.shape) == 2 else 1
+
+    @property
+    def cols(self):
+        """Column count for 2-D tensors (the flat length for vectors)."""
+        return self.shape[1] if len(self.shape) == 2 else len(self.data)
+
+    # ── In-place operations (zero per-element dispatch) ──
+
+    def add_inplace(self, other):
+        """self += other, elementwise. Returns self for chaining."""
+        self._check_same_shape(other)
+        self.data[:] = array("f", map(operator.add, self.data, other.data))
+        return self
+
+    def sub_inplace(self, other):
+        """self -= other, elementwise. Returns self for chaining."""
+        self._check_same_shape(other)
+        self.data[:] = array("f", map(operator.sub, self.data, other.data))
+        return self
+
+    def hadamard_inplace(self, other):
+        """self *= other, elementwise. Returns self for chaining."""
+        self._check_same_shape(other)
+        self.data[:] = array("f", map(operator.mul, self.data, other.data))
+        return self
+
+    def scale_inplace(self, scalar):
+        """self *= scalar. Returns self for chaining."""
+        s = float(scalar)
+        self.data[:] = array("f", map(s.__mul__, self.data))
+        return self
+
+    def normalize_inplace(self):
+        """L2-normalize the whole buffer in place. Returns self."""
+        norm = math.sqrt(sum(map(operator.mul, self.data, self.data)))
+        if norm > 0.0:
+            inv = 1.0 / norm
+            self.data[:] = array("f", map(inv.__mul__, self.data))
+        return self
+
+    # ── Out-of-place operations ──
+
+    def dot(self, other):
+        """Flat dot product against another tensor of the same size."""
+        if len(self.data) != len(other.data):
+            raise RegisterError(
+                f"dot size mismatch: {len(self.data)} vs {len(other.data)}")
+        return sum(map(operator.mul, self.data, other.data))
+
+    def row(self, i):
+        """One row of a 2-D tensor as a flat slice (copy)."""
+        c = self.cols
+        return self.data[i * c:(i + 1) * c]
+
+    def copy(self):
+        return Tensor(array("f", self.data), self.shape)
+
+    # ── Internals ──
+
+    def _check_same_shape(self, other):
+        if self.shape != other.shape:
+            raise RegisterError(
+                f"shape mismatch: {self.shape} vs {other.shape}")
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"Tensor(shape={self.shape}, size={len(self.data)})"
+
+
+class RegisterFile:
+    """The VM's register state: GP integers, tensors, and contexts."""
+
+    NUM_GP = 256
+    NUM_TENSOR = 64
+    NUM_CONTEXT = 16
+
+    def __init__(self):
+        self._gp = [0] * self.NUM_GP
+        self._tensor = [None] * self.NUM_TENSOR
+        self._context = [None] * self.NUM_CONTEXT
+
+    # ── General-purpose (R) ──
+
+    def get_reg(self, idx):
+        self._check(idx, self.NUM_GP, "R")
+        return self._gp[idx]
+
+    def set_reg(self, idx, value):
+        self._check(idx, self.NUM_GP, "R")
+        self._gp[idx] = int(value)
+
+    # ── Tensor (TR) ──
+
+    def get_treg(self, idx):
+        self._check(idx, self.NUM_TENSOR, "TR")
+        return self._tensor[idx]
+
+    def set_treg(self, idx, tensor):
+        self._check(idx, self.NUM_TENSOR, "TR")
+        self._tensor[idx] = tensor
+
+    # ── Context (CR) ──
+
+    def get_creg(self, idx):
+        self._check(idx, self.NUM_CONTEXT, "CR")
+        return self._context[idx]
+
+    def set_creg(self, idx, value):
+        self._check(idx, self.NUM_CONTEXT, "CR")
+        self._context[idx] = value
+
+    def clear(self):
+        """Zero GP registers in place; drop tensor and context refs."""
+        gp = self._gp
+        for i in range(len(gp)):
+            gp[i] = 0
+        for i in range(self.NUM_TENSOR):
+            self._tensor[i] = None
+        for i in range(self.NUM_CONTEXT):
+            self._context[i] = None
+
+    @staticmethod
+    def _check(idx, limit, prefix):
+        if not 0 <= idx < limit:
+            raise RegisterError(f"{prefix}{idx} out of range (0–{limit - 1})")
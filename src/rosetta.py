@@ -0,0 +1,305 @@
+"""
+ROSETTA v1.1 — bidirectional transpiler and macro layer.
+
+Transpiles between human-readable pseudocode and SCRAWL instructions,
+in both directions. The roundtrip rule from CONTRIBUTING.md applies:
+`decompile → compile → decompile` must be byte-identical. Opcodes with
+no pseudocode sugar decompile to their raw mnemonic form
+(`C_PROPOSE 1, 0, [0, 1]`), which the compiler also accepts.
+
+Macros are user-defined compound operations: a macro call expands to a
+list of native instructions. Expansion is memoized — each distinct
+call string is parsed and expanded once into an immutable template;
+repeat calls copy the template instead of re-parsing and re-running
+the expander, so hot agents pay a dict hit plus one list copy.
+"""
+
+import ast
+import re
+
+from .opcodes import (
+    ALL_DOMAINS, TensorOp, AttentionOp, ExecutionOp, IdentityOp,
+    ComposeMode, mnemonic,
+)
+from .synapse import Instruction, encode_instruction
+
+
+class CompileError(Exception):
+    """Raised in strict mode for source that doesn't compile."""
+
+
+_MNEMONIC_TO_OP = {
+    op.name: op for domain in ALL_DOMAINS for op in domain
+}
+
+_CALL_RE = re.compile(r"^\s*(\w+)\s*\((.*)\)\s*$")
+_REG_RE = re.compile(r"^(TR|CR|R)(\d+)$")
+
+
+def _parse_value(token):
+    """One pseudocode argument: register name, int, or float."""
+    token = token.strip()
+    m = _REG_RE.match(token)
+    if m:
+        return int(m.group(2))
+    try:
+        return ast.literal_eval(token)
+    except (ValueError, SyntaxError):
+        raise CompileError(f"cannot parse argument {token!r}") from None
+
+
+def _parse_args(argstr):
+    """Comma-split honoring brackets; each piece through _parse_value."""
+    if not argstr.strip():
+        return []
+    return [_parse_value(tok)
+            for tok in re.split(r",(?![^\[\]]*\])", argstr)]
+
+
+# ─── Macro layer ─────────────────────────────────────────────────────
+
+class RosettaMacro:
+    """A named compound operation.
+
+    `expand` is a callable taking the parsed arguments (register
+    indices as ints) and returning a list of Instructions. Macros must
+    be deterministic: same arguments, same instruction sequence.
+    """
+
+    def __init__(self, name, params, expand, description=""):
+        self.name = name
+        self.params = list(params)
+        self.expand = expand
+        self.description = description
+
+    def __repr__(self):
+        return f"RosettaMacro({self.name}({', '.join(self.params)}))"
+
+
+_MACROS = {}
+
+# call string -> tuple of (opcode, operand-tuple) template rows
+_EXPANSION_CACHE = {}
+
+
+def register_macro(macro):
+    """Register (or replace) a macro. Invalidates cached expansions."""
+    _MACROS[macro.name] = macro
+    _EXPANSION_CACHE.clear()
+
+
+def get_macros():
+    """The live macro registry (name → RosettaMacro)."""
+    return _MACROS
+
+
+def expand_macro_full(call):
+    """Expand a macro call string into native instructions.
+
+    Memoized on the exact call string: the first expansion parses the
+    call, runs the macro, and freezes the result as a template; every
+    later call with the same string returns fresh Instructions sharing
+    the template's frozen operand tuples — no re-parse, no list copies.
+    """
+    template = _EXPANSION_CACHE.get(call)
+    if template is None:
+        m = _CALL_RE.match(call)
+        if not m:
+            raise CompileError(f"malformed macro call {call!r}")
+        name, argstr = m.group(1), m.group(2)
+        macro = _MACROS.get(name)
+        if macro is None:
+            raise CompileError(f"unknown macro {name!r}")
+        args = _parse_args(argstr)
+        if len(args) != len(macro.params):
+            raise CompileError(
+                f"{name} expects {len(macro.params)} arguments, "
+                f"got {len(args)}")
+        expanded = macro.expand(*args)
+        template = tuple(
+            (inst.opcode, inst.operands) for inst in expanded)
+        _EXPANSION_CACHE[call] = template
+    return [Instruction(op, operands) for op, operands in template]
+
+
+# ─── Built-in macros ─────────────────────────────────────────────────
+
+def _fused_attention(q, k, v, dst):
+    """Normalize Q and K, then route attention in one fused kernel."""
+    return [
+        Instruction(TensorOp.T_NORM, [q, q, 2]),
+        Instruction(TensorOp.T_NORM, [k, k, 2]),
+        Instruction(AttentionOp.A_ROUTE, [q, k, v, dst]),
+    ]
+
+
+def _self_attention(src, dst):
+    """Self-attention: Q = K = V = src."""
+    return [Instruction(AttentionOp.A_SELF, [src, dst])]
+
+
+def _residual_route(q, k, v, dst):
+    """Attention routing with a residual add of the query."""
+    return [
+        Instruction(AttentionOp.A_ROUTE, [q, k, v, dst]),
+        Instruction(TensorOp.T_COMPOSE, [dst, dst, q, ComposeMode.ADD]),
+    ]
+
+
+register_macro(RosettaMacro(
+    "fused_attention", ["q", "k", "v", "dst"], _fused_attention,
+    "Normalized attention routing: softmax(norm(Q)·norm(K)ᵀ)·V"))
+register_macro(RosettaMacro(
+    "self_attention", ["src", "dst"], _self_attention,
+    "Self-attention over a single tensor"))
+register_macro(RosettaMacro(
+    "residual_route", ["q", "k", "v", "dst"], _residual_route,
+    "Attention routing plus residual query add"))
+
+
+# ─── Compiler ────────────────────────────────────────────────────────
+
+def compile_program(source, strict=True):
+    """Compile ROSETTA pseudocode into a list of Instructions.
+
+    In strict mode unparseable lines raise CompileError; otherwise
+    they are skipped.
+    """
+    instructions = []
+    for lineno, raw_line in enumerate(source.split("\n"), start=1):
+        line = raw_line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        try:
+            instructions.extend(_compile_line(line))
+        except CompileError as err:
+            if strict:
+                raise CompileError(f"line {lineno}: {err}") from None
+    return instructions
+
+
+def _compile_line(line):
+    # Bare statements
+    if line == "halt":
+        return [Instruction(ExecutionOp.X_HALT)]
+    if line == "nop":
+        return [Instruction(ExecutionOp.X_NOP)]
+    m = re.match(r"^yield\s+R(\d+)$", line)
+    if m:
+        return [Instruction(ExecutionOp.X_YIELD, [int(m.group(1))])]
+
+    # Raw mnemonic form: `C_PROPOSE 1, 0, [0, 1]`
+    m = re.match(r"^([A-Z]_[A-Z_]+)\s*(.*)$", line)
+    if m and m.group(1) in _MNEMONIC_TO_OP:
+        return [Instruction(_MNEMONIC_TO_OP[m.group(1)],
+                            _parse_args(m.group(2)))]
+
+    # Assignment sugar: `R1 = identity.verify(CR0, R0)`
+    m = re.match(r"^(TR|CR|R)(\d+)\s*=\s*(\w+)\.(\w+)\s*\((.*)\)$", line)
+    if m:
+        prefix, idx, domain, method = m.groups()[:4]
+        dst = int(m.group(2))
+        args = _parse_kwargs_or_args(m.group(5))
+        return [_compile_call(prefix, dst, f"{domain}.{method}", args)]
+
+    # Macro call
+    m = _CALL_RE.match(line)
+    if m and m.group(1) in _MACROS:
+        return expand_macro_full(line)
+
+    raise CompileError(f"cannot compile {line!r}")
+
+
+def _parse_kwargs_or_args(argstr):
+    """Arguments of a method call; keyword values keep source order."""
+    if not argstr.strip():
+        return []
+    values = []
+    for tok in re.split(r",(?![^\[\]]*\])", argstr):
+        tok = tok.strip()
+        if "=" in tok:
+            tok = tok.split("=", 1)[1].strip()
+        values.append(_parse_value(tok))
+    return values
+
+
+def _compile_call(prefix, dst, method, args):
+    if method == "identity.derive":
+        if prefix != "CR" or len(args) != 2:
+            raise CompileError("identity.derive wants CRn = (seed, depth)")
+        return Instruction(IdentityOp.I_DERIVE, [dst, args[0], args[1]])
+    if method == "identity.verify":
+        if len(args) != 2:
+            raise CompileError("identity.verify wants (CRc, Rsrc)")
+        return Instruction(IdentityOp.I_VERIFY, [args[0], args[1], dst])
+    if method == "identity.fingerprint":
+        if len(args) != 1:
+            raise CompileError("identity.fingerprint wants (CRc)")
+        return Instruction(IdentityOp.I_FINGERPRINT, [dst, args[0]])
+    if method == "attention.self":
+        if len(args) != 1:
+            raise CompileError("attention.self wants (TRsrc)")
+        return Instruction(AttentionOp.A_SELF, [args[0], dst])
+    if method == "attention.route":
+        if len(args) != 3:
+            raise CompileError("attention.route wants (TRq, TRk, TRv)")
+        return Instruction(AttentionOp.A_ROUTE,
+                           [args[0], args[1], args[2], dst])
+    raise CompileError(f"unknown method {method!r}")
+
+
+# ─── Decompiler ──────────────────────────────────────────────────────
+
+def decompile(instructions, include_hex=False):
+    """Decompile instructions to ROSETTA pseudocode.
+
+    With include_hex=True every line carries its SYNAPSE encoding as a
+    trailing comment.
+    """
+    lines = [
+        "# ROSETTA v1.1 — decompiled program",
+        f"# Instructions: {len(instructions)}",
+    ]
+    for inst in instructions:
+        text = _decompile_instruction(inst)
+        if include_hex:
+            # bytes.hex runs the whole dump in C — no per-byte
+            # f-string formatting in a Python loop.
+            text = f"{text:<44s} # {encode_instruction(inst).hex(' ')}"
+        lines.append(text)
+    return "\n".join(lines)
+
+
+def _decompile_instruction(inst):
+    op = int(inst.opcode)
+    ops = inst.operands
+    if op == IdentityOp.I_DERIVE:
+        return (f"CR{ops[0]} = identity.derive("
+                f"seed=0x{ops[1]:X}, depth={ops[2]})")
+    if op == IdentityOp.I_VERIFY:
+        return f"R{ops[2]} = identity.verify(CR{ops[0]}, R{ops[1]})"
+    if op == IdentityOp.I_FINGERPRINT:
+        return f"R{ops[0]} = identity.fingerprint(CR{ops[1]})"
+    if op == AttentionOp.A_SELF:
+        return f"TR{ops[1]} = attention.self(TR{ops[0]})"
+    if op == AttentionOp.A_ROUTE:
+        return (f"TR{ops[3]} = attention.route("
+                f"TR{ops[0]}, TR{ops[1]}, TR{ops[2]})")
+    if op == ExecutionOp.X_HALT:
+        return "halt"
+    if op == ExecutionOp.X_NOP:
+        return "nop"
+    if op == ExecutionOp.X_YIELD:
+        return f"yield R{ops[0]}"
+    # Raw mnemonic form for everything else
+    if not ops:
+        return mnemonic(op)
+    return f"{mnemonic(op)} {', '.join(_format_operand(o) for o in ops)}"
+
+
+def _format_operand(value):
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):            # covers IntEnum operands too
+        return str(int(value))
+    return repr(value)
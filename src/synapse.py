@@ -0,0 +1,293 @@
+"""
+SYNAPSE v1.0 — the SCRAWL binary wire format.
+
+Frame layout (little-endian throughout):
+
+    Magic   4B   b'SYNP'
+    Version 1B   0x11
+    Flags   1B
+    SeqID   4B   per-encoder frame counter
+    Count   2B   instruction count
+    Payload var  encoded instructions
+    CRC     4B   CRC-32C over everything before it
+
+Each instruction encodes as `opcode u8 | n_operands u8 | operands`,
+with one tag byte per operand selecting the narrowest representation:
+
+    0x01 i8    0x02 i16    0x03 i32    0x04 i64
+    0x05 f64   0x06 int list (u8 count + i32 each)    0x07 u64
+
+Typical instructions land in 4–12 bytes.
+"""
+
+import struct
+
+from .opcodes import OPCODE_BY_VALUE, mnemonic
+
+
+MAGIC = b"SYNP"
+VERSION = 0x11
+HEADER_FMT = "<4sBBIH"
+HEADER_SIZE = struct.calcsize(HEADER_FMT)
+
+_TAG_I8 = 0x01
+_TAG_I16 = 0x02
+_TAG_I32 = 0x03
+_TAG_I64 = 0x04
+_TAG_F64 = 0x05
+_TAG_LIST = 0x06
+_TAG_U64 = 0x07
+
+
+class SynapseError(Exception):
+    """Raised on malformed, truncated, or corrupt frames."""
+
+
+class Instruction:
+    """One SCRAWL instruction: an opcode plus its operands.
+
+    Slotted and immutable-by-convention: operands freeze into a tuple
+    at construction, so an instruction is three fixed slots with no
+    per-instance __dict__ and no independently-growing operand list —
+    decoded instruction streams cost a tuple per instruction, nothing
+    more.
+    """
+
+    __slots__ = ("opcode", "op_int", "operands")
+
+    def __init__(self, opcode, operands=None):
+        self.opcode = opcode
+        # Resolved once here so the VM dispatch loop never touches the
+        # enum machinery (.value lookup) per executed instruction.
+        self.op_int = int(opcode)
+        self.operands = tuple(operands) if operands is not None else ()
+
+    @property
+    def mnemonic(self):
+        return mnemonic(self.op_int)
+
+    def __repr__(self):
+        return f"Instruction({self.mnemonic}, {self.operands})"
+
+    def __eq__(self, other):
+        return (isinstance(other, Instruction)
+                and self.op_int == other.op_int
+                and self.operands == other.operands)
+
+
+# ─── CRC-32C (Castagnoli), table-driven ──────────────────────────────
+
+def _build_crc32c_table():
+    poly = 0x82F63B78
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ poly if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC32C_TABLE = _build_crc32c_table()
+
+
+def crc32c(data):
+    """CRC-32C checksum of `data`."""
+    table = _CRC32C_TABLE
+    crc = 0xFFFFFFFF
+    for byte in data:
+        crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+
+# ─── Instruction encoding ────────────────────────────────────────────
+
+def _operand_size(value):
+    """Encoded size in bytes of one operand (tag included)."""
+    if isinstance(value, bool) or isinstance(value, int):
+        value = int(value)
+        if -0x80 <= value <= 0x7F:
+            return 2
+        if -0x8000 <= value <= 0x7FFF:
+            return 3
+        if -0x8000_0000 <= value <= 0x7FFF_FFFF:
+            return 5
+        # i64, or u64 for fingerprints and friends in [2^63, 2^64)
+        if -0x8000_0000_0000_0000 <= value <= 0xFFFF_FFFF_FFFF_FFFF:
+            return 9
+        raise SynapseError(f"operand {value} exceeds 64 bits")
+    if isinstance(value, float):
+        return 9
+    if isinstance(value, (list, tuple)):
+        if len(value) > 0xFF:
+            raise SynapseError(f"operand list too long ({len(value)})")
+        return 2 + 4 * len(value)
+    raise SynapseError(f"unencodable operand {value!r}")
+
+
+def _instruction_size(inst):
+    """Encoded size in bytes of one instruction."""
+    operands = inst.operands
+    if len(operands) > 0xFF:
+        raise SynapseError(f"too many operands ({len(operands)})")
+    return 2 + sum(_operand_size(v) for v in operands)
+
+
+def _pack_operand_into(buf, off, value):
+    """Write one tagged operand at `off`; returns the new offset."""
+    if isinstance(value, bool) or isinstance(value, int):
+        value = int(value)
+        if -0x80 <= value <= 0x7F:
+            struct.pack_into("<Bb", buf, off, _TAG_I8, value)
+            return off + 2
+        if -0x8000 <= value <= 0x7FFF:
+            struct.pack_into("<Bh", buf, off, _TAG_I16, value)
+            return off + 3
+        if -0x8000_0000 <= value <= 0x7FFF_FFFF:
+            struct.pack_into("<Bi", buf, off, _TAG_I32, value)
+            return off + 5
+        if value <= 0x7FFF_FFFF_FFFF_FFFF:
+            struct.pack_into("<Bq", buf, off, _TAG_I64, value)
+        else:
+            struct.pack_into("<BQ", buf, off, _TAG_U64, value)
+        return off + 9
+    if isinstance(value, float):
+        struct.pack_into("<Bd", buf, off, _TAG_F64, value)
+        return off + 9
+    # list/tuple — sizes were validated during the sizing pass
+    struct.pack_into(f"<BB{len(value)}i", buf, off, _TAG_LIST, len(value),
+                     *(int(v) for v in value))
+    return off + 2 + 4 * len(value)
+
+
+def _pack_instruction_into(buf, off, inst):
+    """Write one instruction at `off`; returns the new offset."""
+    struct.pack_into("<BB", buf, off, inst.op_int, len(inst.operands))
+    off += 2
+    for value in inst.operands:
+        off = _pack_operand_into(buf, off, value)
+    return off
+
+
+def encode_instruction(inst):
+    """Encode a single instruction to bytes (also used for hex dumps)."""
+    buf = bytearray(_instruction_size(inst))
+    _pack_instruction_into(buf, 0, inst)
+    return bytes(buf)
+
+
+# ─── Encoder / Decoder ───────────────────────────────────────────────
+
+class SynapseEncoder:
+    """Encodes instruction lists into SYNAPSE frames."""
+
+    def __init__(self):
+        self.seq = 0
+
+    def encode_frame(self, instructions, flags=0):
+        """Encode `instructions` into one framed, checksummed message.
+
+        Sizes the whole frame in a first pass, then packs header,
+        payload, and CRC directly into one preallocated buffer — no
+        per-instruction bytes objects and no final join-copy.
+        """
+        body = HEADER_SIZE + sum(_instruction_size(i) for i in instructions)
+        buf = bytearray(body + 4)
+        struct.pack_into(HEADER_FMT, buf, 0,
+                         MAGIC, VERSION, flags, self.seq, len(instructions))
+        self.seq += 1
+        off = HEADER_SIZE
+        for inst in instructions:
+            off = _pack_instruction_into(buf, off, inst)
+        struct.pack_into("<I", buf, body, crc32c(memoryview(buf)[:body]))
+        return bytes(buf)
+
+
+class SynapseDecoder:
+    """Decodes SYNAPSE frames back into instruction lists."""
+
+    def decode_frame(self, frame):
+        """Decode one frame. Returns (instructions, metadata).
+
+        Works through a memoryview with struct.unpack_from — fields
+        read straight out of the incoming buffer, no per-field bytes
+        copies. Raises SynapseError on bad magic, truncation, or CRC
+        mismatch.
+        """
+        if len(frame) < HEADER_SIZE + 4:
+            raise SynapseError("frame too short")
+        mv = memoryview(frame)
+
+        magic, version, flags, seq, count = struct.unpack_from(
+            HEADER_FMT, mv, 0)
+        if magic != MAGIC:
+            raise SynapseError(f"bad magic {magic!r}")
+
+        end = len(mv) - 4
+        (expected_crc,) = struct.unpack_from("<I", mv, end)
+        actual_crc = crc32c(mv[:end])
+        if actual_crc != expected_crc:
+            raise SynapseError(
+                f"CRC mismatch: frame says {expected_crc:08X}, "
+                f"computed {actual_crc:08X}")
+
+        instructions = []
+        off = HEADER_SIZE
+        for _ in range(count):
+            if off + 2 > end:
+                raise SynapseError("truncated instruction header")
+            opcode = mv[off]
+            n_operands = mv[off + 1]
+            off += 2
+            operands = []
+            for _ in range(n_operands):
+                value, off = self._decode_operand(mv, off, end)
+                operands.append(value)
+            op_enum = OPCODE_BY_VALUE.get(opcode, opcode)
+            instructions.append(Instruction(op_enum, operands))
+
+        if off != end:
+            raise SynapseError(f"{end - off} trailing payload bytes")
+
+        metadata = {
+            "version": version,
+            "flags": flags,
+            "seq": seq,
+            "count": count,
+            "crc": expected_crc,
+        }
+        return instructions, metadata
+
+    @staticmethod
+    def _decode_operand(mv, off, end):
+        if off >= end:
+            raise SynapseError("truncated operand tag")
+        tag = mv[off]
+        off += 1
+        if tag == _TAG_I8:
+            size, fmt = 1, "<b"
+        elif tag == _TAG_I16:
+            size, fmt = 2, "<h"
+        elif tag == _TAG_I32:
+            size, fmt = 4, "<i"
+        elif tag == _TAG_I64:
+            size, fmt = 8, "<q"
+        elif tag == _TAG_U64:
+            size, fmt = 8, "<Q"
+        elif tag == _TAG_F64:
+            size, fmt = 8, "<d"
+        elif tag == _TAG_LIST:
+            if off >= end:
+                raise SynapseError("truncated list operand")
+            n = mv[off]
+            off += 1
+            if off + 4 * n > end:
+                raise SynapseError("truncated list operand")
+            values = list(struct.unpack_from(f"<{n}i", mv, off))
+            return values, off + 4 * n
+        else:
+            raise SynapseError(f"unknown operand tag 0x{tag:02X}")
+        if off + size > end:
+            raise SynapseError("truncated operand value")
+        (value,) = struct.unpack_from(fmt, mv, off)
+        return value, off + size
@@ -0,0 +1,578 @@
+"""
+SCRAWL VM v1.1 — register-based execution engine.
+
+A ScrawlVM owns a RegisterFile (256 GP / 64 tensor / 16 context), the
+identity baselines it has derived, and open consensus proposals.
+`execute(program)` runs a list of Instructions to X_HALT (or the end
+of the program) and returns an ExecutionResult.
+
+Trace hooks: every notable event (consensus rounds, identity
+verification failures, …) is emitted as a TraceEvent with a severity.
+External callbacks registered via `add_trace_hook` see every event;
+`get_trace_events(min_severity)` filters the retained log.
+
+The attention kernel behind A_ROUTE / A_SELF is fused: Q·Kᵀ, softmax,
+and ·V happen in a single streaming pass per query row, accumulating
+the weighted value sum as key/value rows go by. The N×N score matrix
+is never materialized, so memory traffic is O(N·d) instead of O(N²) —
+same arithmetic, far less memory.
+"""
+
+import operator
+import time
+from array import array
+from collections import namedtuple
+from enum import IntEnum
+from math import exp
+
+from .identity import IdentityBaseline
+from .opcodes import (
+    TensorOp, AttentionOp, ExecutionOp, ConsensusOp, IdentityOp,
+    N_OPCODES, mnemonic,
+)
+from .registers import RegisterFile, Tensor
+
+
+class VMError(Exception):
+    """Raised on invalid programs or failed instructions."""
+
+
+class TraceSeverity(IntEnum):
+    """Severity of a trace event, ordered for threshold filtering."""
+    DEBUG = 0
+    INFO = 1
+    WARN = 2
+    ERROR = 3
+    FATAL = 4
+
+
+TraceEvent = namedtuple(
+    "TraceEvent", ["severity", "domain", "event_type", "message"])
+
+
+class ExecutionResult:
+    """What one `vm.execute()` call did."""
+
+    def __init__(self, instructions_executed, execution_time_ms,
+                 yielded_values, trace_events, halted):
+        self.instructions_executed = instructions_executed
+        self.execution_time_ms = execution_time_ms
+        self.yielded_values = yielded_values
+        self.trace_events = trace_events
+        self.halted = halted
+
+    def __repr__(self):
+        return (f"ExecutionResult(instructions={self.instructions_executed}, "
+                f"time={self.execution_time_ms:.3f}ms, halted={self.halted})")
+
+
+# Vote-slot sentinel: the agent hasn't voted yet.
+_VOTE_NONE = -1
+
+
+class _Proposal:
+    """Book-keeping for one open consensus proposal.
+
+    Votes live in a fixed int8 slot per roster agent
+    (`array.array('b')`), not a dict — recording a vote is one indexed
+    store, and the commit tally is a single contiguous pass over the
+    byte buffer regardless of roster size.
+    """
+
+    def __init__(self, data, agents):
+        self.data = data
+        self.agents = list(agents)
+        self._slot = {agent: i for i, agent in enumerate(self.agents)}
+        self.votes = array("b", bytes([0xFF]) * len(self.agents))  # all -1
+        self.threshold = 0.5
+        self.committed = None
+
+
+# Sentinel returned by handlers that stop execution.
+_HALT = object()
+
+# Default shape for tensors materialized by T_FILL on an empty register.
+_DEFAULT_FILL_SHAPE = (4,)
+
+
+class ScrawlVM:
+    """The SCRAWL execution engine."""
+
+    # Retained trace events: older ones fall off the back of the ring.
+    TRACE_CAPACITY = 4096
+
+    def __init__(self):
+        self.registers = RegisterFile()
+        self.baselines = {}
+        self.proposals = {}
+        self.agent_id = 0
+        self.instruction_timeout_ms = None
+        self._trace_hooks = []
+        # Preallocated ring of TraceEvents plus a byte sidecar of
+        # severities: emission is two slot stores and a counter bump,
+        # and severity filtering scans the sidecar without touching
+        # the event tuples.
+        self._trace_ring = [None] * self.TRACE_CAPACITY
+        self._trace_sev = bytearray(self.TRACE_CAPACITY)
+        self._trace_count = 0
+
+    def reset(self):
+        """Warm restart: clear execution state, keep the machinery.
+
+        Registers zero in place and baselines/proposals/trace history
+        drop, but the preallocated register file, the dispatch table,
+        `agent_id`, and registered trace hooks all survive — reusing a
+        VM across rounds costs O(registers), not O(VM init).
+        """
+        self.registers.clear()
+        self.baselines.clear()
+        self.proposals.clear()
+        ring = self._trace_ring
+        for i in range(len(ring)):
+            ring[i] = None
+        self._trace_count = 0
+
+    # ── Trace API ──
+
+    def add_trace_hook(self, hook):
+        """Register a callback invoked with every TraceEvent."""
+        self._trace_hooks.append(hook)
+
+    @property
+    def trace_events(self):
+        """All retained events, oldest first."""
+        return self._trace_window(0)
+
+    def get_trace_events(self, min_severity=TraceSeverity.DEBUG):
+        """All retained events at or above `min_severity`."""
+        threshold = int(min_severity)
+        cap = self.TRACE_CAPACITY
+        count = self._trace_count
+        ring = self._trace_ring
+        sev = self._trace_sev
+        return [ring[i % cap] for i in range(max(0, count - cap), count)
+                if sev[i % cap] >= threshold]
+
+    def _trace_window(self, start):
+        """Retained events from global index `start` on, oldest first."""
+        cap = self.TRACE_CAPACITY
+        count = self._trace_count
+        ring = self._trace_ring
+        return [ring[i % cap] for i in range(max(start, count - cap), count)]
+
+    def _emit(self, severity, domain, event_type, message):
+        event = TraceEvent(int(severity), domain, event_type, message)
+        idx = self._trace_count % self.TRACE_CAPACITY
+        self._trace_ring[idx] = event
+        self._trace_sev[idx] = event.severity
+        self._trace_count += 1
+        for hook in self._trace_hooks:
+            hook(event)
+
+    # ── Execution ──
+
+    def compile_program(self, program):
+        """Specialize `program` into a callable of one VM argument.
+
+        Generates (via exec) a function whose body is the program's
+        handler calls spelled out in sequence, each closing over its
+        handler and frozen operand tuple — no fetch loop, no dispatch
+        index, no bounds checks at run time. The callable is cached by
+        program content, and `execute()` runs the cached version when
+        it sees the same program again.
+
+        Only straight-line programs compile: an unimplemented opcode
+        raises VMError here, exactly as the interpreter would at run
+        time. X_HALT truncates generation (everything after it is
+        unreachable), and compiled programs skip the per-instruction
+        timeout check, so `execute()` ignores the cache while
+        `instruction_timeout_ms` is set.
+        """
+        key = _program_key(program)
+        fn = _COMPILED_CACHE.get(key)
+        if fn is not None:
+            return fn
+
+        namespace = {
+            "_perf": time.perf_counter,
+            "_ExecutionResult": ExecutionResult,
+        }
+        lines = [
+            "def _run(vm):",
+            "    t0 = _perf()",
+            "    events_before = vm._trace_count",
+            "    yielded = []",
+            "    vm._yielded = yielded",
+        ]
+        executed = 0
+        halted = False
+        for pc, inst in enumerate(program):
+            op = inst.op_int
+            handler = _DISPATCH_TABLE[op] if op < N_OPCODES else None
+            if handler is None:
+                raise VMError(
+                    f"unimplemented opcode {mnemonic(op)} at pc={pc}")
+            executed += 1
+            if op == int(ExecutionOp.X_HALT):
+                halted = True
+                break
+            if op == int(ExecutionOp.X_NOP):
+                continue
+            namespace[f"_h{pc}"] = handler
+            namespace[f"_o{pc}"] = inst.operands
+            lines.append(f"    _h{pc}(vm, _o{pc})")
+        lines.append(
+            "    return _ExecutionResult("
+            f"instructions_executed={executed}, "
+            "execution_time_ms=(_perf() - t0) * 1000.0, "
+            "yielded_values=yielded, "
+            "trace_events=vm._trace_window(events_before), "
+            f"halted={halted})")
+        exec("\n".join(lines), namespace)
+        fn = namespace["_run"]
+        _COMPILED_CACHE[key] = fn
+        return fn
+
+    def execute(self, program):
+        """Run `program` to X_HALT (or program end). Returns ExecutionResult."""
+        if _COMPILED_CACHE and self.instruction_timeout_ms is None:
+            fn = _COMPILED_CACHE.get(_program_key(program))
+            if fn is not None:
+                return fn(self)
+        t_start = time.perf_counter()
+        events_before = self._trace_count
+        yielded = []
+        self._yielded = yielded
+        executed = 0
+        halted = False
+        timeout_s = (self.instruction_timeout_ms / 1000.0
+                     if self.instruction_timeout_ms is not None else None)
+
+        dispatch = _DISPATCH_TABLE
+        pc = 0
+        n = len(program)
+        while pc < n:
+            inst = program[pc]
+            op = inst.op_int
+            handler = dispatch[op] if op < N_OPCODES else None
+            if handler is None:
+                raise VMError(
+                    f"unimplemented opcode {mnemonic(op)} at pc={pc}")
+            if timeout_s is not None:
+                t_i = time.perf_counter()
+                outcome = handler(self, inst.operands)
+                if time.perf_counter() - t_i > timeout_s:
+                    raise VMError(
+                        f"{mnemonic(op)} exceeded "
+                        f"{self.instruction_timeout_ms}ms at pc={pc}")
+            else:
+                outcome = handler(self, inst.operands)
+            executed += 1
+            if outcome is _HALT:
+                halted = True
+                break
+            pc += 1
+
+        elapsed_ms = (time.perf_counter() - t_start) * 1000.0
+        return ExecutionResult(
+            instructions_executed=executed,
+            execution_time_ms=elapsed_ms,
+            yielded_values=yielded,
+            trace_events=self._trace_window(events_before),
+            halted=halted,
+        )
+
+    # ── Execution domain ──
+
+    def _op_nop(self, operands):
+        pass
+
+    def _op_halt(self, operands):
+        return _HALT
+
+    def _op_yield(self, operands):
+        (reg,) = operands
+        self._yielded.append(self.registers.get_reg(reg))
+
+    def _op_abort(self, operands):
+        code = operands[0] if operands else 0
+        self._emit(TraceSeverity.FATAL, "execution", "abort",
+                   f"X_ABORT code={code}")
+        raise VMError(f"program aborted (code={code})")
+
+    # ── Identity domain ──
+
+    def _op_i_derive(self, operands):
+        creg, seed, depth = operands
+        baseline = IdentityBaseline(seed, depth)
+        self.baselines[creg] = baseline
+        self.registers.set_creg(creg, baseline)
+        self._emit(TraceSeverity.DEBUG, "identity", "derive",
+                   f"CR{creg} = baseline(seed=0x{seed:X}, depth={depth})")
+
+    def _op_i_verify(self, operands):
+        creg, _src, dst = operands
+        baseline = self._baseline(creg)
+        ok = baseline.verify()
+        self.registers.set_reg(dst, 1 if ok else 0)
+        if not ok:
+            self._emit(TraceSeverity.ERROR, "identity", "verify",
+                       f"CR{creg} chain failed verification")
+
+    def _op_i_fingerprint(self, operands):
+        dst, creg = operands
+        self.registers.set_reg(dst, self._baseline(creg).fingerprint64())
+
+    def _baseline(self, creg):
+        baseline = self.baselines.get(creg)
+        if baseline is None:
+            raise VMError(f"CR{creg} holds no baseline (I_DERIVE first)")
+        return baseline
+
+    # ── Consensus domain ──
+
+    def _op_c_propose(self, operands):
+        pid, data_reg, agents = operands
+        self.proposals[pid] = _Proposal(self.registers.get_reg(data_reg),
+                                        agents)
+        self._emit(TraceSeverity.INFO, "consensus", "propose",
+                   f"proposal {pid} by agent {self.agent_id} "
+                   f"to {len(agents)} agents")
+
+    def _op_c_quorum(self, operands):
+        pid, threshold = operands
+        self._proposal(pid).threshold = float(threshold)
+        self._emit(TraceSeverity.DEBUG, "consensus", "quorum",
+                   f"proposal {pid} quorum set to {threshold:.0%}")
+
+    def _op_c_vote(self, operands):
+        pid, agent, vote = operands
+        proposal = self._proposal(pid)
+        slot = proposal._slot.get(agent)
+        if slot is None:
+            self._emit(TraceSeverity.WARN, "consensus", "vote",
+                       f"agent {agent} is not on proposal {pid}'s roster")
+            return
+        if proposal.votes[slot] != _VOTE_NONE:
+            self._emit(TraceSeverity.DEBUG, "consensus", "vote",
+                       f"agent {agent} re-votes on proposal {pid}")
+        proposal.votes[slot] = 0 if vote == 0 else 1
+        word = "APPROVE" if vote == 0 else "REJECT"
+        self._emit(TraceSeverity.INFO, "consensus", "vote",
+                   f"agent {agent} votes {word} on proposal {pid}")
+
+    def _op_c_commit(self, operands):
+        pid, dst = operands
+        proposal = self._proposal(pid)
+        # One contiguous pass over the int8 slots — count() runs at
+        # C level, independent of how the votes arrived.
+        approvals = proposal.votes.count(0)
+        ratio = approvals / len(proposal.agents) if proposal.agents else 0.0
+        met = ratio >= proposal.threshold
+        proposal.committed = met
+        self.registers.set_reg(dst, 1 if met else 0)
+        if met:
+            self._emit(TraceSeverity.INFO, "consensus", "commit",
+                       f"proposal {pid} committed "
+                       f"({approvals}/{len(proposal.agents)} approve)")
+        else:
+            self._emit(TraceSeverity.WARN, "consensus", "commit",
+                       f"proposal {pid} quorum not met "
+                       f"({approvals}/{len(proposal.agents)} approve, "
+                       f"need {proposal.threshold:.0%})")
+
+    def _proposal(self, pid):
+        proposal = self.proposals.get(pid)
+        if proposal is None:
+            raise VMError(f"no proposal {pid} (C_PROPOSE first)")
+        return proposal
+
+    # ── Tensor domain ──
+
+    def _op_t_fill(self, operands):
+        treg, value = operands
+        tensor = self.registers.get_treg(treg)
+        if tensor is None:
+            self.registers.set_treg(
+                treg, Tensor.filled(_DEFAULT_FILL_SHAPE, value))
+        else:
+            v = float(value)
+            tensor.data[:] = array("f", [v] * len(tensor.data))
+
+    def _op_t_copy(self, operands):
+        dst, src = operands
+        self.registers.set_treg(dst, self._tensor(src).copy())
+
+    def _op_t_norm(self, operands):
+        dst, src, _order = operands
+        tensor = self._tensor(src)
+        if dst != src:
+            tensor = tensor.copy()
+            self.registers.set_treg(dst, tensor)
+        tensor.normalize_inplace()
+
+    def _op_t_compose(self, operands):
+        dst, a_reg, b_reg, mode = operands
+        mode = int(mode)
+        if not 0 <= mode < len(_COMPOSE):
+            raise VMError(f"unsupported compose mode {mode}")
+        self.registers.set_treg(
+            dst, _COMPOSE[mode](self._tensor(a_reg), self._tensor(b_reg)))
+
+    def _tensor(self, treg):
+        tensor = self.registers.get_treg(treg)
+        if tensor is None:
+            raise VMError(f"TR{treg} holds no tensor")
+        return tensor
+
+    # ── Attention domain ──
+
+    def _op_a_route(self, operands):
+        q_reg, k_reg, v_reg, dst = operands
+        out = self._attention(self._tensor(q_reg), self._tensor(k_reg),
+                              self._tensor(v_reg))
+        self.registers.set_treg(dst, out)
+
+    def _op_a_self(self, operands):
+        src, dst = operands
+        tensor = self._tensor(src)
+        self.registers.set_treg(dst, self._attention(tensor, tensor, tensor))
+
+    @staticmethod
+    def _attention(q, k, v):
+        """Fused softmax(Q·Kᵀ)·V in one streaming pass per query.
+
+        For each query row, key/value rows stream through once: the
+        score, its exponential, and the weighted value contribution are
+        produced together and folded into running accumulators. No
+        score or probability matrix is ever materialized — peak extra
+        memory is one d-wide accumulator per query, O(N·d) total
+        instead of O(N²).
+
+        The softmax is the online max-subtract form: every exponential
+        is exp(score - running_max), and when a new maximum arrives the
+        accumulators rescale by exp(old_max - new_max). Exponents never
+        exceed zero, so large scores can't overflow exp() and the
+        result matches the two-pass max-subtracted softmax exactly.
+        """
+        if q.cols != k.cols or k.rows != v.rows:
+            raise VMError(
+                f"attention shape mismatch Q{q.shape} K{k.shape} V{v.shape}")
+        d = q.cols
+        d_v = v.cols
+        n_q, n_k = q.rows, k.rows
+        qd, kd, vd = q.data, k.data, v.data
+
+        out = array("f", bytes(4 * n_q * d_v))
+        mul = operator.mul
+        neg_inf = float("-inf")
+        for qi in range(n_q):
+            q_row = qd[qi * d:(qi + 1) * d]
+            acc = [0.0] * d_v
+            denom = 0.0
+            running_max = neg_inf
+            for ki in range(n_k):
+                score = sum(map(mul, q_row, kd[ki * d:(ki + 1) * d]))
+                if score > running_max:
+                    if running_max != neg_inf:
+                        rescale = exp(running_max - score)
+                        denom *= rescale
+                        acc[:] = map(rescale.__mul__, acc)
+                    running_max = score
+                weight = exp(score - running_max)
+                denom += weight
+                v_base = ki * d_v
+                for j in range(d_v):
+                    acc[j] += weight * vd[v_base + j]
+            inv = 1.0 / denom
+            out[qi * d_v:(qi + 1) * d_v] = array("f", map(inv.__mul__, acc))
+        return Tensor(out, (n_q, d_v))
+
+
+def _compose_dot(a, b):
+    return Tensor([a.dot(b)], (1,))
+
+
+def _compose_add(a, b):
+    return a.copy().add_inplace(b)
+
+
+def _compose_sub(a, b):
+    return a.copy().sub_inplace(b)
+
+
+def _compose_hadamard(a, b):
+    return a.copy().hadamard_inplace(b)
+
+
+def _compose_matmul(a, b):
+    if a.cols != b.rows:
+        raise VMError(f"matmul shape mismatch {a.shape} x {b.shape}")
+    n, k, m = a.rows, a.cols, b.cols
+    out = array("f", bytes(4 * n * m))
+    for i in range(n):
+        arow = a.data[i * k:(i + 1) * k]
+        for j in range(m):
+            bcol = b.data[j::m]
+            out[i * m + j] = sum(map(operator.mul, arow, bcol))
+    return Tensor(out, (n, m))
+
+
+# T_COMPOSE dispatch, indexed by the ComposeMode int — one tuple
+# index instead of an enum-comparison chain per call.
+_COMPOSE = (
+    _compose_dot,       # ComposeMode.DOT
+    _compose_add,       # ComposeMode.ADD
+    _compose_sub,       # ComposeMode.SUB
+    _compose_hadamard,  # ComposeMode.HADAMARD
+    _compose_matmul,    # ComposeMode.MATMUL
+)
+
+
+def _build_dispatch_table():
+    """Flat handler table indexed by opcode int.
+
+    Built once at import, ahead of any execution — VM construction
+    does zero dispatch setup and every instance shares the same table.
+    Handlers are the plain functions off the class; `execute` passes
+    the VM explicitly. Unimplemented opcodes hold None.
+    """
+    table = [None] * N_OPCODES
+    for op, handler in {
+        int(ExecutionOp.X_NOP): ScrawlVM._op_nop,
+        int(ExecutionOp.X_HALT): ScrawlVM._op_halt,
+        int(ExecutionOp.X_YIELD): ScrawlVM._op_yield,
+        int(ExecutionOp.X_ABORT): ScrawlVM._op_abort,
+        int(IdentityOp.I_DERIVE): ScrawlVM._op_i_derive,
+        int(IdentityOp.I_VERIFY): ScrawlVM._op_i_verify,
+        int(IdentityOp.I_FINGERPRINT): ScrawlVM._op_i_fingerprint,
+        int(ConsensusOp.C_PROPOSE): ScrawlVM._op_c_propose,
+        int(ConsensusOp.C_QUORUM): ScrawlVM._op_c_quorum,
+        int(ConsensusOp.C_VOTE): ScrawlVM._op_c_vote,
+        int(ConsensusOp.C_COMMIT): ScrawlVM._op_c_commit,
+        int(TensorOp.T_FILL): ScrawlVM._op_t_fill,
+        int(TensorOp.T_COPY): ScrawlVM._op_t_copy,
+        int(TensorOp.T_NORM): ScrawlVM._op_t_norm,
+        int(TensorOp.T_COMPOSE): ScrawlVM._op_t_compose,
+        int(AttentionOp.A_ROUTE): ScrawlVM._op_a_route,
+        int(AttentionOp.A_SELF): ScrawlVM._op_a_self,
+    }.items():
+        table[op] = handler
+    return table
+
+
+_DISPATCH_TABLE = _build_dispatch_table()
+
+
+def _program_key(program):
+    """Hashable content key for a program (roster lists become tuples)."""
+    return tuple(
+        (inst.op_int,
+         tuple(tuple(v) if isinstance(v, list) else v
+               for v in inst.operands))
+        for inst in program)
+
+
+# Specialized executors from ScrawlVM.compile_program, shared by all
+# VM instances and keyed by program content.
+_COMPILED_CACHE = {}